@@ -1,30 +1,101 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import socket
-from datetime import datetime
+from contextlib import asynccontextmanager, suppress
+from time import gmtime, strftime
 
-from typing import Dict, List, Optional
-from uuid import UUID
+from typing import Iterable, List, Optional
+from uuid import UUID, uuid4
 
-from fastapi import FastAPI, HTTPException, Query, Path
+from fastapi import Body, FastAPI, HTTPException, Query, Path
+from fastapi.responses import ORJSONResponse, Response
 
 from models.employee import EmployeeCreate, EmployeeRead, EmployeeUpdate
 from models.company import CompanyCreate, CompanyRead, CompanyUpdate
 from models.health import Health
+from models.openapi_examples import (
+    COMPANY_CREATE_EXAMPLES,
+    COMPANY_UPDATE_EXAMPLES,
+    EMPLOYEE_CREATE_EXAMPLES,
+    EMPLOYEE_UPDATE_EXAMPLES,
+)
+from services import crud
 
 port = int(os.environ.get("FASTAPIPORT", 8000))
 
-# -----------------------------------------------------------------------------
-# Fake in-memory "databases"
-# -----------------------------------------------------------------------------
-employees: Dict[UUID, EmployeeRead] = {}
-companies: Dict[UUID, CompanyRead] = {}
+DEFAULT_HOST_IP_REFRESH_SECONDS = 30.0
+
+
+def _host_ip_refresh_seconds() -> float:
+    try:
+        seconds = float(os.environ.get("HOST_IP_REFRESH_SECONDS", DEFAULT_HOST_IP_REFRESH_SECONDS))
+    except ValueError:
+        return DEFAULT_HOST_IP_REFRESH_SECONDS
+    # Zero or less (or NaN) would re-resolve back to back in the executor
+    return seconds if seconds > 0 else DEFAULT_HOST_IP_REFRESH_SECONDS
+
+
+HOST_IP_REFRESH_SECONDS = _host_ip_refresh_seconds()
+
+# Resolved once at import and then refreshed in the background (see lifespan),
+# so /health never does a blocking lookup on the request path
+try:
+    _HOST_IP = socket.gethostbyname(socket.gethostname())
+except OSError:
+    _HOST_IP = "127.0.0.1"
+
+
+async def _refresh_host_ip() -> None:
+    global _HOST_IP
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(HOST_IP_REFRESH_SECONDS)
+        try:
+            infos = await loop.getaddrinfo(socket.gethostname(), None, family=socket.AF_INET)
+        except OSError:
+            continue  # keep the last known address
+        if infos:
+            _HOST_IP = str(infos[0][4][0])
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(_refresh_host_ip())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+def _json_response(content: bytes, status_code: int = 200) -> Response:
+    # Records are already serialized by orjson when stored, so hand the bytes
+    # back as-is instead of letting the response model re-encode them
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
+
+def _json_array(items: Iterable[bytes]) -> Response:
+    # ``items`` may lazily walk live index structures; joining here, before the
+    # handler yields to the loop, keeps that iteration free of concurrent writes
+    return _json_response(b"[" + b",".join(items) + b"]")
+
 
+def _company_not_found(exc: crud.UnknownCompany) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Company {exc.company_id} not found")
+
+
+# Every handler is async def, so all access to the in-memory stores runs on the
+# event loop one handler at a time. Writes update several indexes and reads
+# iterate them, so no handler may move to the threadpool.
 app = FastAPI(
     title="Employee/Company API",
     description="Demo FastAPI app using Pydantic v2 models for Employee and Company",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # -----------------------------------------------------------------------------
@@ -35,88 +106,82 @@ def make_health(echo: Optional[str], path_echo: Optional[str]=None) -> Health:
     return Health(
         status=200,
         status_message="OK",
-        timestamp=datetime.utcnow().isoformat() + "Z",
-        ip_address=socket.gethostbyname(socket.gethostname()),
+        timestamp=strftime("%Y-%m-%dT%H:%M:%SZ", gmtime()),
+        ip_address=_HOST_IP,
         echo=echo,
         path_echo=path_echo
     )
 
 @app.get("/health", response_model=Health)
-def get_health_no_path(echo: str | None = Query(None, description="Optional echo string")):
+async def get_health_no_path(echo: str | None = Query(None, description="Optional echo string")):
     # Works because path_echo is optional in the model
     return make_health(echo=echo, path_echo=None)
 
 @app.get("/health/{path_echo}", response_model=Health)
-def get_health_with_path(
+async def get_health_with_path(
     path_echo: str = Path(..., description="Required echo in the URL path"),
     echo: str | None = Query(None, description="Optional echo string"),
 ):
     return make_health(echo=echo, path_echo=path_echo)
 
 @app.post("/companies", response_model=CompanyRead, status_code=201)
-def create_company(company: CompanyCreate):
-    company_read = CompanyRead(**company.model_dump())
-    if company_read.id in companies:
+async def create_company(company: CompanyCreate = Body(..., openapi_examples=COMPANY_CREATE_EXAMPLES)):
+    company_read = crud.new_company(company, uuid4())
+    key = company_read.id.bytes
+    if key in crud.companies:
         raise HTTPException(status_code=400, detail="Company with this ID already exists")
-    companies[company_read.id] = company_read
-    return company_read
+    crud.put_company(company_read)
+    return _json_response(crud.company_json[key], status_code=201)
 
 @app.get("/companies", response_model=List[CompanyRead])
-def list_companies(
+async def list_companies(
     name: Optional[str] = Query(None, description="Filter by company name"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
     size: Optional[str] = Query(None, description="Filter by company size"),
 ):
-    results = list(companies.values())
-    if name is not None:
-        results = [c for c in results if c.name == name]
-    if industry is not None:
-        results = [c for c in results if c.industry == industry]
-    if size is not None:
-        results = [c for c in results if c.size == size]
-    return results
+    matching_sets = crud.lookup(crud.company_idx, {"name": name, "industry": industry, "size": size})
+    if not matching_sets:
+        return _json_array(crud.company_json.values())
+    return _json_array(crud.company_json[i] for i in crud.intersect(matching_sets))
 
 @app.get("/companies/{company_id}", response_model=CompanyRead)
-def get_company(company_id: UUID):
-    if company_id not in companies:
+async def get_company(company_id: UUID):
+    key = company_id.bytes
+    if key not in crud.companies:
         raise HTTPException(status_code=404, detail="Company not found")
-    return companies[company_id]
+    return _json_response(crud.company_json[key])
 
 @app.patch("/companies/{company_id}", response_model=CompanyRead)
-def update_company(company_id: UUID, update: CompanyUpdate):
-    if company_id not in companies:
+async def update_company(
+    company_id: UUID,
+    update: CompanyUpdate = Body(..., openapi_examples=COMPANY_UPDATE_EXAMPLES),
+):
+    key = company_id.bytes
+    if key not in crud.companies:
         raise HTTPException(status_code=404, detail="Company not found")
-    stored = companies[company_id].model_dump()
-    stored.update(update.model_dump(exclude_unset=True))
-    companies[company_id] = CompanyRead(**stored)
-    return companies[company_id]
+    crud.patch_company(key, update.model_dump(exclude_unset=True))
+    return _json_response(crud.company_json[key])
 
 @app.put("/companies/{company_id}", response_model=CompanyRead)
-def replace_company(company_id: UUID, company: CompanyCreate):
-    if company_id not in companies:
+async def replace_company(
+    company_id: UUID,
+    company: CompanyCreate = Body(..., openapi_examples=COMPANY_CREATE_EXAMPLES),
+):
+    if company_id.bytes not in crud.companies:
         raise HTTPException(status_code=404, detail="Company not found")
 
     # Ensure the ID from path is used, ignoring any ID in the body if present
-    company_data = company.model_dump()
-    company_data["id"] = company_id
-
-    company_read = CompanyRead(**company_data)
-    companies[company_id] = company_read
+    company_read = crud.new_company(company, company_id)
+    crud.put_company(company_read)
 
-    return company_read
+    return _json_response(crud.company_json[company_id.bytes])
 
 @app.delete("/companies/{company_id}", status_code=204)
-def delete_company(company_id: UUID):
-    if company_id not in companies:
+async def delete_company(company_id: UUID):
+    key = company_id.bytes
+    if key not in crud.companies:
         raise HTTPException(status_code=404, detail="Company not found")
-    # Remove company from any employees' companies list
-    for emp_id, emp in employees.items():
-        updated_companies = [c for c in emp.companies if c.id != company_id]
-        if len(updated_companies) != len(emp.companies):
-            emp_dict = emp.model_dump()
-            emp_dict["companies"] = updated_companies
-            employees[emp_id] = EmployeeRead(**emp_dict)
-    del companies[company_id]
+    crud.delete_company(key)
     return
 
 
@@ -124,29 +189,24 @@ def delete_company(company_id: UUID):
 # Employee endpoints
 # -----------------------------------------------------------------------------
 @app.post("/employees", response_model=EmployeeRead, status_code=201)
-def create_employee(employee: EmployeeCreate):
-    # Validate company_ids exist before creating employee
-    for company_id in employee.company_ids:
-        if company_id not in companies:
-            raise HTTPException(status_code=404, detail=f"Company {company_id} not found")
+async def create_employee(employee: EmployeeCreate = Body(..., openapi_examples=EMPLOYEE_CREATE_EXAMPLES)):
+    # Validate company_ids exist and resolve them before creating employee
+    try:
+        linked_companies = crud.linked_companies(employee.company_ids)
+    except crud.UnknownCompany as exc:
+        raise _company_not_found(exc) from None
 
-    # Prepare list of CompanyRead objects for this employee
-    linked_companies = [companies[cid] for cid in employee.company_ids]
+    employee_read = crud.new_employee(employee, uuid4(), linked_companies)
+    key = employee_read.id.bytes
 
-    # Safely get the dict, and remove "companies" if present
-    employee_data = employee.model_dump(exclude={"company_ids"})
-    employee_data.pop("companies", None) 
-
-    employee_read = EmployeeRead(**employee_data, companies=linked_companies)
-
-    if employee_read.id in employees:
+    if key in crud.employees:
         raise HTTPException(status_code=400, detail="Employee with this ID already exists")
 
-    employees[employee_read.id] = employee_read
-    return employee_read
+    crud.put_employee(employee_read)
+    return _json_response(crud.employee_json[key], status_code=201)
 
 @app.get("/employees", response_model=List[EmployeeRead])
-def list_employees(
+async def list_employees(
     employee_id: Optional[str] = Query(None, description="Filter by employee ID"),
     first_name: Optional[str] = Query(None, description="Filter by first name"),
     last_name: Optional[str] = Query(None, description="Filter by last name"),
@@ -157,97 +217,113 @@ def list_employees(
     min_years_of_exp: Optional[int] = Query(None, description="Filter by minimum years of experience"),
     company_name: Optional[str] = Query(None, description="Filter by company name associated with employee"),
 ):
-    results = list(employees.values())
-
-    if employee_id is not None:
-        results = [e for e in results if e.employee_id == employee_id]
-    if first_name is not None:
-        results = [e for e in results if e.first_name == first_name]
-    if last_name is not None:
-        results = [e for e in results if e.last_name == last_name]
-    if email is not None:
-        results = [e for e in results if e.email == email]
-    if phone is not None:
-        results = [e for e in results if e.phone == phone]
-    if department is not None:
-        results = [e for e in results if e.department == department]
-    if team is not None:
-        results = [e for e in results if e.team == team]
-    if min_years_of_exp is not None:
-        results = [e for e in results if e.yearsofexp >= min_years_of_exp]
+    matching_sets = crud.lookup(crud.employee_idx, {
+        "employee_id": employee_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": email,
+        "phone": phone,
+        "department": department,
+        "team": team,
+    })
     if company_name is not None:
-        results = [e for e in results if any(c.name == company_name for c in e.companies)]
-
-    return results
+        matching_sets.append(crud.employee_by_company_name.get(company_name, set()))
+
+    if matching_sets:
+        candidate_ids = crud.intersect(matching_sets)
+        if min_years_of_exp is not None:
+            # Check the (already narrowed) candidates in the same pass rather than
+            # materializing every id in the experience range just to intersect it
+            return _json_array(
+                crud.employee_json[i] for i in candidate_ids if crud.employees[i].yearsofexp >= min_years_of_exp
+            )
+    elif min_years_of_exp is not None:
+        return _json_array(crud.employee_json[eid] for _, eid in crud.employees_by_exp.irange_key(min_years_of_exp))
+    else:
+        return _json_array(crud.employee_json.values())
+    return _json_array(crud.employee_json[i] for i in candidate_ids)
 
 @app.get("/employees/{employee_id}", response_model=EmployeeRead)
-def get_employee(employee_id: UUID):
-    if employee_id not in employees:
+async def get_employee(employee_id: UUID):
+    key = employee_id.bytes
+    if key not in crud.employees:
         raise HTTPException(status_code=404, detail="Employee not found")
-    return employees[employee_id]
+    return _json_response(crud.employee_json[key])
 
 @app.patch("/employees/{employee_id}", response_model=EmployeeRead)
-def update_employee(employee_id: UUID, update: EmployeeUpdate):
-    if employee_id not in employees:
+async def update_employee(
+    employee_id: UUID,
+    update: EmployeeUpdate = Body(..., openapi_examples=EMPLOYEE_UPDATE_EXAMPLES),
+):
+    key = employee_id.bytes
+    if key not in crud.employees:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    stored = employees[employee_id].model_dump()
-
-    update_data = update.model_dump(exclude_unset=True)
-
-    # If company_ids are updated, validate and update linked companies
-    if "company_ids" in update_data:
-        new_company_ids = update_data.pop("company_ids")
-        for cid in new_company_ids:
-            if cid not in companies:
-                raise HTTPException(status_code=404, detail=f"Company {cid} not found")
-        linked_companies = [companies[cid] for cid in new_company_ids]
-        stored["companies"] = linked_companies
-
-    stored.update(update_data)
-    employees[employee_id] = EmployeeRead(**stored)
-    return employees[employee_id]
+    try:
+        crud.patch_employee(key, update.model_dump(exclude_unset=True))
+    except crud.UnknownCompany as exc:
+        raise _company_not_found(exc) from None
+    return _json_response(crud.employee_json[key])
 
 @app.put("/employees/{employee_id}", response_model=EmployeeRead)
-def replace_employee(employee_id: UUID, employee: EmployeeCreate):
-    if employee_id not in employees:
+async def replace_employee(
+    employee_id: UUID,
+    employee: EmployeeCreate = Body(..., openapi_examples=EMPLOYEE_CREATE_EXAMPLES),
+):
+    if employee_id.bytes not in crud.employees:
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    for company_id in employee.company_ids:
-        if company_id not in companies:
-            raise HTTPException(status_code=404, detail=f"Company {company_id} not found")
+    try:
+        linked_companies = crud.linked_companies(employee.company_ids)
+    except crud.UnknownCompany as exc:
+        raise _company_not_found(exc) from None
 
-    linked_companies = [companies[cid] for cid in employee.company_ids]
+    # Reconstruct with the path id and linked companies
+    employee_read = crud.new_employee(employee, employee_id, linked_companies)
 
-    # Dump data and remove keys that will be passed explicitly
-    employee_data = employee.model_dump(exclude={"company_ids"})
-    employee_data.pop("id", None)         # Remove if it exists
-    employee_data.pop("companies", None)  # Just in case
-
-    # Reconstruct with new id and linked companies
-    employee_read = EmployeeRead(id=employee_id, **employee_data, companies=linked_companies)
-
-    employees[employee_id] = employee_read
-    return employee_read
+    crud.put_employee(employee_read)
+    return _json_response(crud.employee_json[employee_id.bytes])
 
 @app.delete("/employees/{employee_id}", status_code=204)
-def delete_employee(employee_id: UUID):
-    if employee_id not in employees:
+async def delete_employee(employee_id: UUID):
+    key = employee_id.bytes
+    if key not in crud.employees:
         raise HTTPException(status_code=404, detail="Employee not found")
-    del employees[employee_id]
+    crud.delete_employee(key)
     return
 
 # -----------------------------------------------------------------------------
 # Root
 # -----------------------------------------------------------------------------
 @app.get("/")
-def root():
+async def root():
     return {"message": "Welcome to the Person/Address API. See /docs for OpenAPI UI."}
 
 # -----------------------------------------------------------------------------
 # Entrypoint for `python main.py`
+#   FASTAPIPORT  port to listen on (default 8000)
+#   RELOAD=1     auto-reload on code changes (development only; off by default)
+#   WORKERS      number of worker processes (default 1; ignored when reloading).
+#                The stores in services/crud.py live in each process, so extra
+#                workers would each serve their own copy of the data. Only 1 is
+#                accepted until the stores move to something shared.
 # -----------------------------------------------------------------------------
 if __name__ == "__main__":
+    import sys
+
     import uvicorn
 
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
+    workers = int(os.environ.get("WORKERS", "1"))
+    if workers > 1:
+        sys.exit("WORKERS > 1 needs a store shared between processes; the in-memory stores are per-process")
+
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        # uvloop has no Windows build; "auto" falls back to asyncio there
+        loop="uvloop" if sys.platform != "win32" else "auto",
+        http="httptools",
+        reload=os.environ.get("RELOAD") == "1",
+        workers=workers,
+    )
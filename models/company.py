@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Optional
 from uuid import UUID, uuid4
 from datetime import datetime, date
-from pydantic import BaseModel, Field, AnyUrl
+from pydantic import BaseModel, Field, AnyUrl, model_validator
 
 class CompanyBase(BaseModel):
     name: str = Field(
@@ -31,25 +32,10 @@ class CompanyBase(BaseModel):
         description="Company size category.",
         example="51-200 employees"
     )
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "name": "Acme Corp",
-                    "website": "https://acme.com",
-                    "industry": "Banking",
-                    "founded": "1999-04-01",
-                    "size": "51-200 employees"
-                }
-            ]
-        }
-    }
-
 
 
 class CompanyCreate(CompanyBase):
     """Payload to create a new company."""
-    model_config = CompanyBase.model_config
 
 
 class CompanyUpdate(BaseModel):
@@ -79,23 +65,14 @@ class CompanyUpdate(BaseModel):
         example="51-200 employees"
     )
 
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "name": "Acme Corp",
-                    "industry": "Fintech",
-                    "website": "https://acme.com",
-                    "founded": "2000-01-01",
-                    "size": "51-200 employees"
-                },
-                {
-                    "name": "Globex Inc.",
-                    "size": "500+ employees"
-                }
-            ]
-        }
-    }
+    @model_validator(mode="after")
+    def _required_fields_not_null(self) -> CompanyUpdate:
+        # Omitting a field leaves it unchanged, but a field that CompanyBase
+        # requires cannot be explicitly set to null
+        for field in self.model_fields_set:
+            if getattr(self, field) is None and CompanyBase.model_fields[field].is_required():
+                raise ValueError(f"{field} may not be null")
+        return self
 
 
 class CompanyRead(CompanyBase):
@@ -115,17 +92,19 @@ class CompanyRead(CompanyBase):
         json_schema_extra={"example": "2025-01-16T12:00:00Z"},
     )
 
-    model_config = {
-        "json_schema_extra": {
-            "example": {
-                "id": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
-                "name": "Acme Corp",
-                "website": "https://acme.com",
-                "industry": "Banking",
-                "founded": "1999-04-01",
-                "size": "51-200 employees",
-                "created_at": "2025-01-01T10:00:00Z",
-                "updated_at": "2025-09-01T12:00:00Z"
-            }
-        }
-    }
\ No newline at end of file
+
+@dataclass(slots=True, frozen=True)
+class CompanyReadStored:
+    """Compact in-memory copy of a CompanyRead.
+
+    Fields are in CompanyRead order so the record serializes to the same JSON;
+    website is kept as a plain string.
+    """
+    name: str
+    website: Optional[str]
+    industry: Optional[str]
+    founded: Optional[date]
+    size: Optional[str]
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
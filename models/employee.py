@@ -1,21 +1,30 @@
 from __future__ import annotations
 
-from typing import Optional, List, Annotated
+import re
+from dataclasses import dataclass
+from typing import Optional, List, Tuple
 from uuid import UUID, uuid4
 from datetime import date, datetime
-from pydantic import BaseModel, Field, EmailStr, StringConstraints
+from pydantic import BaseModel, Field, EmailStr, field_validator, model_validator
 
-from .company import CompanyRead
+from .company import CompanyRead, CompanyReadStored
 
 # Custom Employee ID — 2–3 uppercase letters + 3–5 digits (e.g., AD123, JDS45678)
-EmployeeIDType = Annotated[str, StringConstraints(pattern=r"^[A-Z]{2,3}\d{3,5}$")]
+EMPLOYEE_ID_PATTERN = r"^[A-Z]{2,3}\d{3,5}$"
+_EMPLOYEE_ID_RE = re.compile(EMPLOYEE_ID_PATTERN)
+
+
+def _check_employee_id(value: Optional[str]) -> Optional[str]:
+    if value is not None and not _EMPLOYEE_ID_RE.fullmatch(value):
+        raise ValueError("employee_id must be 2–3 uppercase letters followed by 3–5 digits")
+    return value
 
 
 class EmployeeBase(BaseModel):
-    employee_id: EmployeeIDType = Field(
+    employee_id: str = Field(
         ...,
         description="Unique employee ID (2–3 uppercase letters followed by 3–5 digits).",
-        json_schema_extra={"example": "AD123"},
+        json_schema_extra={"example": "AD123", "pattern": EMPLOYEE_ID_PATTERN},
     )
     first_name: str = Field(
         ...,
@@ -74,33 +83,7 @@ class EmployeeBase(BaseModel):
         },
     )
 
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "employee_id": "AD123",
-                    "first_name": "Ada",
-                    "last_name": "Lovelace",
-                    "email": "ada@example.com",
-                    "phone": "+1-212-555-0199",
-                    "birth_date": "1815-12-10",
-                    "department": "Software Engineering",
-                    "team": "Bill Automation",
-                    "yearsofexp": 4,
-                    "companies": [
-                        {
-                            "id": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
-                            "name": "Acme Corp",
-                            "website": "https://acme.com",
-                            "industry": "Banking",
-                            "founded": "1999-04-01",
-                            "size": "51-200 employees",
-                        }
-                    ],
-                }
-            ]
-        }
-    }
+    _validate_employee_id = field_validator("employee_id")(_check_employee_id)
 
 
 class EmployeeCreate(EmployeeBase):
@@ -109,32 +92,13 @@ class EmployeeCreate(EmployeeBase):
         ..., description="List of company UUIDs this employee is associated with."
     )
 
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "employee_id": "JD567",
-                    "first_name": "Grace",
-                    "last_name": "Hopper",
-                    "email": "grace.hopper@navy.mil",
-                    "phone": "+1-202-555-0101",
-                    "birth_date": "1906-12-09",
-                    "department": "Human Resources",
-                    "team": "University Recruiting",
-                    "yearsofexp": 10,
-                    "company_ids": [
-                        "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
-                    ]
-                }
-            ]
-        }
-    }
-
 
 class EmployeeUpdate(BaseModel):
     """Partial update for an Employee; supply only fields to change."""
-    employee_id: Optional[EmployeeIDType] = Field(
-        None, description="Employee ID.", json_schema_extra={"example": "JD567"}
+    employee_id: Optional[str] = Field(
+        None,
+        description="Employee ID.",
+        json_schema_extra={"example": "JD567", "pattern": EMPLOYEE_ID_PATTERN},
     )
     first_name: Optional[str] = Field(None, json_schema_extra={"example": "Bill"})
     last_name: Optional[str] = Field(None, json_schema_extra={"example": "Chen"})
@@ -150,15 +114,16 @@ class EmployeeUpdate(BaseModel):
         json_schema_extra={"example": ["aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"]}
     )
 
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {"first_name": "Alan", "last_name": "Turing"},
-                {"email": "alan.turing@bletchley.gov.uk"},
-                {"company_ids": ["bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"]}
-            ]
-        }
-    }
+    _validate_employee_id = field_validator("employee_id")(_check_employee_id)
+
+    @model_validator(mode="after")
+    def _required_fields_not_null(self) -> EmployeeUpdate:
+        # Omitting a field leaves it unchanged, but a field that EmployeeCreate
+        # requires cannot be explicitly set to null
+        for field in self.model_fields_set:
+            if getattr(self, field) is None and EmployeeCreate.model_fields[field].is_required():
+                raise ValueError(f"{field} may not be null")
+        return self
 
 
 class EmployeeRead(EmployeeBase):
@@ -195,33 +160,20 @@ class EmployeeRead(EmployeeBase):
         },
     )
 
-    model_config = {
-        "json_schema_extra": {
-            "examples": [
-                {
-                    "id": "99999999-9999-4999-8999-999999999999",
-                    "employee_id": "AD123",
-                    "first_name": "Ada",
-                    "last_name": "Lovelace",
-                    "email": "ada@example.com",
-                    "phone": "+1-212-555-0199",
-                    "birth_date": "1815-12-10",
-                    "department": "Software Engineering",
-                    "team": "Bill Automation",
-                    "yearsofexp": 4,
-                    "companies": [
-                        {
-                            "id": "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa",
-                            "name": "Acme Corp",
-                            "website": "https://acme.com",
-                            "industry": "Banking",
-                            "founded": "1999-04-01",
-                            "size": "51-200 employees",
-                        }
-                    ],
-                    "created_at": "2025-01-15T10:20:30Z",
-                    "updated_at": "2025-01-16T12:00:00Z",
-                }
-            ]
-        }
-    }
+
+@dataclass(slots=True, frozen=True)
+class EmployeeReadStored:
+    """Compact in-memory copy of an EmployeeRead, fields in EmployeeRead order."""
+    employee_id: str
+    first_name: str
+    last_name: str
+    email: str
+    phone: str
+    birth_date: Optional[date]
+    department: str
+    team: str
+    yearsofexp: int
+    companies: Tuple[CompanyReadStored, ...]
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
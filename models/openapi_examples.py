@@ -0,0 +1,71 @@
+"""Request-body examples for the OpenAPI docs.
+
+Kept out of the models' ``model_config`` so they are only referenced when the
+schema is generated; main.py attaches them per endpoint via ``openapi_examples``.
+"""
+from typing import Dict
+
+from fastapi.openapi.models import Example
+
+COMPANY_CREATE_EXAMPLES: Dict[str, Example] = {
+    "acme": {
+        "summary": "Full company record",
+        "value": {
+            "name": "Acme Corp",
+            "website": "https://acme.com",
+            "industry": "Banking",
+            "founded": "1999-04-01",
+            "size": "51-200 employees",
+        },
+    },
+}
+
+COMPANY_UPDATE_EXAMPLES: Dict[str, Example] = {
+    "full": {
+        "summary": "Update every field",
+        "value": {
+            "name": "Acme Corp",
+            "industry": "Fintech",
+            "website": "https://acme.com",
+            "founded": "2000-01-01",
+            "size": "51-200 employees",
+        },
+    },
+    "partial": {
+        "summary": "Rename and resize",
+        "value": {"name": "Globex Inc.", "size": "500+ employees"},
+    },
+}
+
+EMPLOYEE_CREATE_EXAMPLES: Dict[str, Example] = {
+    "grace": {
+        "summary": "Employee linked to one company",
+        "value": {
+            "employee_id": "JD567",
+            "first_name": "Grace",
+            "last_name": "Hopper",
+            "email": "grace.hopper@navy.mil",
+            "phone": "+1-202-555-0101",
+            "birth_date": "1906-12-09",
+            "department": "Human Resources",
+            "team": "University Recruiting",
+            "yearsofexp": 10,
+            "company_ids": ["aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"],
+        },
+    },
+}
+
+EMPLOYEE_UPDATE_EXAMPLES: Dict[str, Example] = {
+    "name": {
+        "summary": "Change name",
+        "value": {"first_name": "Alan", "last_name": "Turing"},
+    },
+    "email": {
+        "summary": "Change email",
+        "value": {"email": "alan.turing@bletchley.gov.uk"},
+    },
+    "companies": {
+        "summary": "Relink companies",
+        "value": {"company_ids": ["bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"]},
+    },
+}
@@ -0,0 +1,222 @@
+"""In-memory stores, their indexes and the record-level CRUD operations.
+
+Everything the HTTP handlers in main.py need to read or mutate the "databases"
+lives here, fully annotated and free of FastAPI routing so the module can be
+compiled with mypyc (``mypyc services/crud.py``). The pure-Python module and
+the compiled extension are interchangeable; loops are written out explicitly
+because mypyc compiles generators poorly.
+
+Nothing here is locked. Writers update several structures in turn, and
+readers iterate live index sets, so all callers must be serialized. main.py
+does this by running every handler as ``async def`` on the event loop.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import orjson
+from sortedcontainers import SortedKeyList  # type: ignore[import-untyped]
+
+from models.company import CompanyCreate, CompanyReadStored
+from models.employee import EmployeeCreate, EmployeeReadStored
+
+Index = Dict[str, Dict[Any, Set[bytes]]]
+
+# -----------------------------------------------------------------------------
+# Fake in-memory "databases"
+# -----------------------------------------------------------------------------
+# Keyed by UUID.bytes rather than UUID: bytes hash and compare in C, which
+# makes every store and index lookup cheaper. The API stays UUID-typed.
+# Values are slotted dataclasses rather than Pydantic models to keep each
+# record small; responses are served from the JSON cache below.
+employees: Dict[bytes, EmployeeReadStored] = {}
+companies: Dict[bytes, CompanyReadStored] = {}
+
+# Serialized JSON for each stored record, refreshed whenever the record changes
+employee_json: Dict[bytes, bytes] = {}
+company_json: Dict[bytes, bytes] = {}
+
+# -----------------------------------------------------------------------------
+# Inverted indexes: field -> value -> ids, kept in sync with the stores above
+# -----------------------------------------------------------------------------
+COMPANY_INDEXED_FIELDS = ("name", "industry", "size")
+EMPLOYEE_INDEXED_FIELDS = (
+    "employee_id", "first_name", "last_name", "email", "phone", "department", "team",
+)
+
+company_idx: Index = {f: defaultdict(set) for f in COMPANY_INDEXED_FIELDS}
+employee_idx: Index = {f: defaultdict(set) for f in EMPLOYEE_INDEXED_FIELDS}
+employee_by_company_name: Dict[str, Set[bytes]] = defaultdict(set)
+# Reverse link: company id -> ids of employees that list it
+employees_by_company: Dict[bytes, Set[bytes]] = defaultdict(set)
+# Range index for min_years_of_exp: (yearsofexp, employee id) ordered by years
+employees_by_exp = SortedKeyList(key=lambda t: t[0])
+
+
+def _discard(ids_by_key: Dict[Any, Set[bytes]], key: Any, record_id: bytes) -> None:
+    ids = ids_by_key.get(key)
+    if ids is not None:
+        ids.discard(record_id)
+        if not ids:
+            del ids_by_key[key]
+
+
+def _index_add(idx: Index, obj: Any) -> None:
+    for field, values in idx.items():
+        values[getattr(obj, field)].add(obj.id.bytes)
+
+
+def _index_remove(idx: Index, obj: Any) -> None:
+    for field, values in idx.items():
+        _discard(values, getattr(obj, field), obj.id.bytes)
+
+
+def lookup(idx: Index, filters: Dict[str, Optional[str]]) -> List[Set[bytes]]:
+    """Return the id set matching each provided (non-None) filter."""
+    return [idx[field].get(value, set()) for field, value in filters.items() if value is not None]
+
+
+def intersect(matching_sets: List[Set[bytes]]) -> Set[bytes]:
+    """Intersect non-empty ``matching_sets``, smallest first.
+
+    A single set is returned as-is, saving a copy on the common one-filter
+    query. It is the live index set, so callers must finish iterating it
+    before any write can run (see the module docstring).
+    """
+    if len(matching_sets) == 1:
+        return matching_sets[0]
+    ordered = sorted(matching_sets, key=len)
+    return ordered[0].intersection(*ordered[1:])
+
+
+def _company_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    # orjson has no encoder for AnyUrl, so the stored website is its string form
+    if data.get("website") is not None:
+        data["website"] = str(data["website"])
+    return data
+
+
+# -----------------------------------------------------------------------------
+# Companies
+# -----------------------------------------------------------------------------
+def new_company(company: CompanyCreate, company_id: UUID) -> CompanyReadStored:
+    # The payload was validated on the way in; build the stored copy without re-validating
+    now = datetime.utcnow()
+    return CompanyReadStored(
+        **_company_fields(dict(company.__dict__)), id=company_id, created_at=now, updated_at=now,
+    )
+
+
+def put_company(company: CompanyReadStored) -> None:
+    key = company.id.bytes
+    content = orjson.dumps(company)  # before touching any store, so a failure leaves them intact
+    old = companies.get(key)
+    if old is not None:
+        _index_remove(company_idx, old)
+    companies[key] = company
+    company_json[key] = content
+    _index_add(company_idx, company)
+
+
+def patch_company(key: bytes, update_data: Dict[str, Any]) -> CompanyReadStored:
+    company = replace(companies[key], **_company_fields(update_data))
+    put_company(company)
+    return company
+
+
+def delete_company(key: bytes) -> None:
+    # Remove company from the companies list of the employees that reference it
+    for emp_key in employees_by_company.pop(key, set()):
+        emp = employees[emp_key]
+        linked = emp.companies
+        # The reverse index guarantees a match, so stop at the first one and
+        # slice around it; only the tail needs checking for repeated links
+        i = 0
+        while linked[i].id.bytes != key:
+            i += 1
+        tail = [c for c in linked[i + 1:] if c.id.bytes != key]
+        put_employee(replace(emp, companies=linked[:i] + tuple(tail)))
+    _index_remove(company_idx, companies.pop(key))
+    del company_json[key]
+
+
+# -----------------------------------------------------------------------------
+# Employees
+# -----------------------------------------------------------------------------
+class UnknownCompany(LookupError):
+    """An employee links a company id that is not in the store."""
+
+    def __init__(self, company_id: UUID) -> None:
+        super().__init__(company_id)
+        self.company_id = company_id
+
+
+def linked_companies(company_ids: List[UUID]) -> Tuple[CompanyReadStored, ...]:
+    """Resolve company ids to stored companies.
+
+    Raises ``UnknownCompany`` for the first id that is not stored.
+    """
+    keys = [cid.bytes for cid in company_ids]
+    missing = set(keys).difference(companies)
+    if missing:
+        for cid in company_ids:
+            if cid.bytes in missing:
+                raise UnknownCompany(cid)
+    return tuple([companies[k] for k in keys])
+
+
+def new_employee(
+    employee: EmployeeCreate, employee_id: UUID, linked: Tuple[CompanyReadStored, ...],
+) -> EmployeeReadStored:
+    employee_data = dict(employee.__dict__)
+    del employee_data["company_ids"]
+    employee_data["companies"] = linked
+    now = datetime.utcnow()
+    return EmployeeReadStored(**employee_data, id=employee_id, created_at=now, updated_at=now)
+
+
+def put_employee(employee: EmployeeReadStored) -> None:
+    key = employee.id.bytes
+    content = orjson.dumps(employee)  # before touching any store, so a failure leaves them intact
+    old = employees.get(key)
+    # Company links (and so the company-name entries) only change when the
+    # companies tuple does; a plain field PATCH carries the old tuple over
+    relink = old is None or old.companies is not employee.companies
+    if old is not None:
+        _unindex_employee(old, unlink=relink)
+    employees[key] = employee
+    employee_json[key] = content
+    _index_add(employee_idx, employee)
+    if relink:
+        for c in employee.companies:
+            employee_by_company_name[c.name].add(key)
+            employees_by_company[c.id.bytes].add(key)
+    employees_by_exp.add((employee.yearsofexp, key))
+
+
+def patch_employee(key: bytes, update_data: Dict[str, Any]) -> EmployeeReadStored:
+    # If company_ids are updated, validate and update linked companies
+    if "company_ids" in update_data:
+        update_data["companies"] = linked_companies(update_data.pop("company_ids"))
+    employee = replace(employees[key], **update_data)
+    put_employee(employee)
+    return employee
+
+
+def _unindex_employee(employee: EmployeeReadStored, unlink: bool = True) -> None:
+    key = employee.id.bytes
+    _index_remove(employee_idx, employee)
+    if unlink:
+        for c in employee.companies:
+            _discard(employee_by_company_name, c.name, key)
+            _discard(employees_by_company, c.id.bytes, key)
+    employees_by_exp.remove((employee.yearsofexp, key))
+
+
+def delete_employee(key: bytes) -> None:
+    _unindex_employee(employees.pop(key))
+    del employee_json[key]